@@ -1,8 +1,18 @@
-"""
-SDLC Agents package.
-"""
-from sdlc_agents.config.config import config
-from sdlc_agents.agents.base_agent import BaseSDLCAgent
-from sdlc_agents.workflows.base_workflow import BaseWorkflow, WorkflowState
-
-__version__ = "0.1.0" 
\ No newline at end of file
+"""
+SDLC Agents package.
+"""
+from sdlc_agents.config.config import config
+from sdlc_agents.agents.base_agent import BaseSDLCAgent
+
+__version__ = "0.1.0"
+
+def __getattr__(name):
+    """Lazily resolve the workflow base re-exports.
+
+    base_workflow pulls in LangGraph, which dominates package import time;
+    defer it until someone actually asks for the workflow classes.
+    """
+    if name in ("BaseWorkflow", "WorkflowState"):
+        from sdlc_agents.workflows.base_workflow import BaseWorkflow, WorkflowState
+        return {"BaseWorkflow": BaseWorkflow, "WorkflowState": WorkflowState}[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
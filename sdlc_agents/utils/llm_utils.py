@@ -1,43 +1,90 @@
 """
 LLM utilities for agent interactions.
 """
-from typing import Dict, Any, Optional
-import openai
+from typing import Optional
+from functools import lru_cache
+import asyncio
+import atexit
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain.schema import StrOutputParser
-from langchain.schema.runnable import RunnablePassthrough
 from sdlc_agents.config.config import config
 
-async def create_llm_chain(system_prompt: str):
-    """Create a LangChain chain with the specified system prompt.
-    
-    Args:
-        system_prompt: The system prompt to use
-        
-    Returns:
-        A LangChain chain
+# Shared HTTP client so back-to-back LLM calls reuse keep-alive connections
+# instead of paying a TCP+TLS handshake per request. HTTP/2 multiplexes
+# retries and batch fan-out over the same warm TLS session, and httpx is
+# loop-agnostic so the pool survives the UI's event-loop churn
+_HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=20,
+        max_keepalive_connections=10,
+        keepalive_expiry=60
+    ),
+    timeout=60.0
+)
+
+def _close_http_client_at_exit() -> None:
+    """Best-effort close of the shared pool at interpreter shutdown."""
+    try:
+        asyncio.run(_HTTP_CLIENT.aclose())
+    except Exception:
+        pass
+
+atexit.register(_close_http_client_at_exit)
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client on shutdown."""
+    await _HTTP_CLIENT.aclose()
+
+@lru_cache(maxsize=1)
+def _get_llm() -> ChatOpenAI:
+    """Build the shared ChatOpenAI client once.
+
+    A single instance keeps one HTTP connection pool warm across every
+    chain instead of re-doing client setup per call.
     """
-    llm = ChatOpenAI(
+    return ChatOpenAI(
         model="gpt-4-turbo-preview",
         temperature=0.7,
         streaming=True,
-        openai_api_key=config.openai_api_key
+        openai_api_key=config.openai_api_key,
+        http_async_client=_HTTP_CLIENT
     )
-    
+
+@lru_cache(maxsize=32)
+def create_llm_chain(system_prompt: str):
+    """Create (or fetch the cached) chain for a system prompt.
+
+    The chain is pure assembly over the shared LLM, so identical system
+    prompts reuse one compiled pipeline instead of rebuilding the prompt
+    template and runnable graph per call. The prompt template accepts the
+    input string directly; no passthrough wrapper is needed.
+
+    Args:
+        system_prompt: The system prompt to use
+
+    Returns:
+        A LangChain chain
+    """
     prompt = ChatPromptTemplate.from_messages([
         ("system", system_prompt),
         ("human", "{input}")
     ])
-    
-    chain = (
-        {"input": RunnablePassthrough()} 
-        | prompt 
-        | llm 
-        | StrOutputParser()
+
+    # Bind static config at build time so per-invoke calls carry no extra
+    # configuration merging
+    return (prompt | _get_llm() | StrOutputParser()).with_config(
+        {"run_name": "sdlc_analysis_chain"}
     )
-    
-    return chain
+
+_DEFAULT_SYSTEM_PROMPT = """You are an expert requirements analyst. Your task is to:
+1. Analyze the given requirements
+2. Break them down into clear, testable acceptance criteria
+3. Structure the output in a clear, markdown format
+4. Ensure all functional and non-functional requirements are covered
+5. Include specific validation methods for each criterion"""
 
 async def execute_prompt(prompt: str, system_prompt: Optional[str] = None) -> str:
     """Execute a prompt using the LLM.
@@ -49,14 +96,20 @@ async def execute_prompt(prompt: str, system_prompt: Optional[str] = None) -> st
     Returns:
         The LLM's response
     """
-    if not system_prompt:
-        system_prompt = """You are an expert requirements analyst. Your task is to:
-1. Analyze the given requirements
-2. Break them down into clear, testable acceptance criteria
-3. Structure the output in a clear, markdown format
-4. Ensure all functional and non-functional requirements are covered
-5. Include specific validation methods for each criterion"""
-    
-    chain = await create_llm_chain(system_prompt)
-    response = await chain.ainvoke(prompt)
-    return response 
\ No newline at end of file
+    chain = create_llm_chain(system_prompt or _DEFAULT_SYSTEM_PROMPT)
+    response = await chain.ainvoke({"input": prompt})
+    return response
+
+async def stream_prompt(prompt: str, system_prompt: Optional[str] = None):
+    """Stream the LLM's response for a prompt as it is generated.
+
+    Args:
+        prompt: The prompt to execute
+        system_prompt: Optional system prompt to use
+
+    Yields:
+        Response chunks in arrival order
+    """
+    chain = create_llm_chain(system_prompt or _DEFAULT_SYSTEM_PROMPT)
+    async for chunk in chain.astream({"input": prompt}):
+        yield chunk 
\ No newline at end of file